@@ -1,15 +1,98 @@
-import json
-import requests
+import orjson
+import os
+import asyncio
+import aiohttp
 import re
 import csv
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+import lxml.html
+from lxml import etree
 
-# Load JSON from file
-with open("courses.json", "r", encoding="utf-8") as f:
-    data = json.load(f)
+# Limits for concurrent fetching
+MAX_CONCURRENT_REQUESTS = 64
+MAX_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = 8
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3  # seconds, doubled after every failed attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
-# Extract the URLs
-urls = [item["url"] for item in data.get("itemListElement", [])]
+# Number of worker processes parsing fetched pages
+PARSE_WORKERS = os.cpu_count() or 1
+
+# Settings shared by every request of the HTTP session
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(sock_connect=15, sock_read=15)
+REQUEST_HEADERS = {
+    'Accept-Encoding': 'gzip, deflate',
+    'User-Agent': 'Mozilla/5.0 (compatible; course-scraper/1.0)'
+}
+
+# CSV columns with both description fields
+FIELDNAMES = ['title', 'url', 'exercises', 'dialect', 'hours', 'kind', 'description', 'detailed_description', 'skills', 'purpose', 'level', 'price']
+
+# Precompiled patterns shared by the extractors below
+_PT_HOURS = re.compile(r'PT(\d+)H')
+_NON_DIGIT = re.compile(r'\D')
+# lxml refuses str input that starts with an XML declaration naming an encoding
+_XML_DECLARATION = re.compile(r'^<\?xml[^>]*\?>')
+_JSON_LD_SCRIPT = re.compile(r'<script[^>]*\stype\s*=\s*["\']?application/ld\+json["\']?[^>]*>(.*?)</script\s*>', re.I | re.S)
+
+# Namespace of the EXSLT regular expression functions used in the XPaths below
+_RE_NS = {'re': 'http://exslt.org/regular-expressions'}
+
+# Predicates matching the skills and description section headings, tried in this order
+_SKILLS_HEADINGS = [
+    "re:test(normalize-space(.), 'Skills you will gain', 'i')",
+    "re:test(@id, 'skillsSection', 'i')",
+    "re:test(@class, 'skillsSection', 'i')"
+]
+_DESC_HEADINGS = [
+    "re:test(normalize-space(.), 'Description', 'i')",
+    "re:test(@id, 'description', 'i')",
+    "re:test(@class, 'description', 'i')"
+]
+
+# Compiled XPath queries shared by the extractors below
+_SKILL_ITEMS = [
+    etree.XPath(f"(//h2[{heading}])[1]/following::ul[1]//li", namespaces=_RE_NS)
+    for heading in _SKILLS_HEADINGS
+]
+# The content class also covers productDescriptionSection__content
+_COURSE_INFO_DIVS = [
+    etree.XPath(f"(//h2[{heading}])[1]/following::div[contains(@class, 'content')][1]//div[contains(@class, 'course_information')]", namespaces=_RE_NS)
+    for heading in _DESC_HEADINGS
+]
+_LOWER_TEXT = "translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_EXERCISES_VALUES = etree.XPath(
+    "//span[contains(concat(' ', normalize-space(@class), ' '), ' productSummarySection__itemLabel ')]"
+    f"[contains({_LOWER_TEXT}, 'coding challenges') or contains({_LOWER_TEXT}, 'exercises')]"
+    "/following-sibling::span[contains(concat(' ', normalize-space(@class), ' '), ' productSummarySection__itemValue ')][1]"
+)
+_TEXT_NODES = etree.XPath(".//text()[normalize-space()]", smart_strings=False)
+
+# Function to read course URLs from the course list
+def read_course_urls(filename='courses.json'):
+    """Read course URLs from the JSON course list"""
+    # Load JSON from file
+    with open(filename, "rb") as f:
+        data = orjson.loads(f.read())
+    
+    # Extract the URLs
+    return [item["url"] for item in data.get("itemListElement", [])]
+
+# Function to get names from a JSON-LD property
+def json_ld_names(value):
+    """Get the names in a JSON-LD property given as text, an object with a name, or a list of them"""
+    if not value:
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    
+    names = []
+    for item in value:
+        name = item.get('name') if isinstance(item, dict) else item
+        if isinstance(name, str) and name.strip():
+            names.append(name.strip())
+    return names
 
 # Function to extract course data from JSON-LD
 def extract_course_data(json_ld_data):
@@ -22,7 +105,7 @@ def extract_course_data(json_ld_data):
         'currency': None,
         'courseWorkload_hours': None,
         'educationalLevel': json_ld_data.get('educationalLevel'),
-        'skills': [],
+        'skills': json_ld_names(json_ld_data.get('teaches')),
         'detailed_description': '',
         'exercises_count': None
     }
@@ -43,143 +126,153 @@ def extract_course_data(json_ld_data):
     
     if workload:
         # Parse ISO 8601 duration format (PT10H -> 10 hours)
-        match = re.search(r'PT(\d+)H', workload)
+        match = _PT_HOURS.search(workload)
         if match:
             course_info['courseWorkload_hours'] = int(match.group(1))
     
     return course_info
 
+# Function to get the text of an element
+def get_text(element):
+    """Get the text of an element, stripping each text fragment like BeautifulSoup's get_text(strip=True)"""
+    # Blank text nodes are dropped by libxml2 before they reach Python
+    return ''.join(text.strip() for text in _TEXT_NODES(element))
+
+# Function to evaluate fallback XPaths in order
+def first_matches(xpaths, node):
+    """Return the matches of the first compiled XPath that matches anything, or an empty list"""
+    for xpath in xpaths:
+        matches = xpath(node)
+        if matches:
+            return matches
+    return []
+
 # Function to extract skills from HTML
-def extract_skills(html_content):
+def extract_skills(tree):
     """Extract skills from 'Skills you will gain' section"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find the skills section heading
-    skills_heading = soup.find('h2', string=re.compile(r'Skills you will gain', re.IGNORECASE))
-    if not skills_heading:
-        # Try to find by id or class
-        skills_heading = soup.find('h2', {'id': re.compile(r'skillsSection', re.IGNORECASE)}) or \
-                        soup.find('h2', {'class': re.compile(r'skillsSection', re.IGNORECASE)})
-    
-    if skills_heading:
-        # Find the next ul element after the heading
-        skills_list = skills_heading.find_next('ul')
-        if skills_list:
-            # Extract all li elements and get their text content
-            skills = []
-            for li in skills_list.find_all('li'):
-                skill_text = li.get_text(strip=True)
-                if skill_text:
-                    skills.append(skill_text)
-            return skills
+    # Find the li elements of the next ul after the skills section heading,
+    # trying the heading text first and then its id or class
+    skill_items = first_matches(_SKILL_ITEMS, tree)
     
-    return []
+    # Get the text content of the li elements
+    skill_texts = (get_text(li) for li in skill_items)
+    return [skill_text for skill_text in skill_texts if skill_text]
 
 # Function to extract detailed description and convert to markdown
-def extract_detailed_description(html_content):
+def extract_detailed_description(tree):
     """Extract detailed description section and convert to markdown"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find the description section heading
-    desc_heading = soup.find('h2', string=re.compile(r'Description', re.IGNORECASE))
-    if not desc_heading:
-        # Try to find by id or class
-        desc_heading = soup.find('h2', {'id': re.compile(r'description', re.IGNORECASE)}) or \
-                      soup.find('h2', {'class': re.compile(r'description', re.IGNORECASE)})
-    
-    if desc_heading:
-        # Find the content section after the heading
-        content_section = desc_heading.find_next('div', class_=re.compile(r'content', re.IGNORECASE))
-        if not content_section:
-            # Try to find productDescriptionSection__content
-            content_section = desc_heading.find_next('div', class_=re.compile(r'productDescriptionSection__content', re.IGNORECASE))
-        
-        if content_section:
-            markdown_content = []
-            
-            # Process all child divs in the content section
-            for div in content_section.find_all('div', class_=re.compile(r'course_information', re.IGNORECASE)):
-                # Convert div content to markdown
-                div_markdown = convert_html_to_markdown(div)
-                if div_markdown.strip():
-                    markdown_content.append(div_markdown)
-            
-            return '\n\n'.join(markdown_content)
+    # Find the course_information divs in the content section after the description heading,
+    # trying the heading text first and then its id or class
+    course_info_divs = first_matches(_COURSE_INFO_DIVS, tree)
     
-    return ''
+    markdown_content = []
+    for div in course_info_divs:
+        # Convert div content to markdown
+        div_markdown = convert_html_to_markdown(div)
+        if div_markdown.strip():
+            markdown_content.append(div_markdown)
+    
+    return '\n\n'.join(markdown_content)
 
 # Function to extract exercises count
-def extract_exercises_count(html_content):
+def extract_exercises_count(tree):
     """Extract number of exercises/coding challenges"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Look for productSummarySection items
-    summary_items = soup.find_all('span', class_=re.compile(r'productSummarySection__itemLabel', re.IGNORECASE))
-    
-    for label_span in summary_items:
-        label_text = label_span.get_text(strip=True).lower()
-        
-        # Check if this is the coding challenges/exercises item
-        if 'coding challenges' in label_text or 'exercises' in label_text:
-            # Find the corresponding value span (next sibling)
-            value_span = label_span.find_next_sibling('span', class_=re.compile(r'productSummarySection__itemValue', re.IGNORECASE))
-            if value_span:
-                try:
-                    # Extract and convert to integer
-                    exercises_text = value_span.get_text(strip=True)
-                    # Remove any non-digit characters and convert to int
-                    exercises_count = int(re.sub(r'\D', '', exercises_text))
-                    return exercises_count
-                except (ValueError, AttributeError):
-                    continue
+    # Value spans that follow a coding challenges/exercises label in productSummarySection
+    for value_span in _EXERCISES_VALUES(tree):
+        try:
+            # Extract and convert to integer
+            exercises_text = get_text(value_span)
+            # Remove any non-digit characters and convert to int
+            exercises_count = int(_NON_DIGIT.sub('', exercises_text))
+            return exercises_count
+        except (ValueError, AttributeError):
+            continue
     
     return None
 
+# Functions to convert single HTML elements to markdown lines
+def h2_to_markdown(element):
+    """Convert an h2 element to markdown lines"""
+    return [f"## {get_text(element)}"]
+
+def h3_to_markdown(element):
+    """Convert an h3 element to markdown lines"""
+    return [f"### {get_text(element)}"]
+
+def p_to_markdown(element):
+    """Convert a p element to markdown lines"""
+    # Paragraphs that only contain images have no text and are skipped
+    text = get_text(element)
+    return [text] if text else []
+
+def ul_to_markdown(element):
+    """Convert a ul element to markdown lines"""
+    lines = []
+    for li in element.iter('li'):
+        li_text = get_text(li)
+        if li_text:
+            lines.append(f"- {li_text}")
+    return lines
+
+def ol_to_markdown(element):
+    """Convert an ol element to markdown lines"""
+    lines = []
+    for i, li in enumerate(element.iter('li'), 1):
+        li_text = get_text(li)
+        if li_text:
+            lines.append(f"{i}. {li_text}")
+    return lines
+
+def text_to_markdown(element):
+    """Convert any other element to markdown lines"""
+    text = get_text(element)
+    return [text] if text else []
+
+# Markdown converters for the elements with dedicated formatting, by tag
+_MARKDOWN_HANDLERS = {
+    'h2': h2_to_markdown,
+    'h3': h3_to_markdown,
+    'p': p_to_markdown,
+    'ul': ul_to_markdown,
+    'ol': ol_to_markdown
+}
+
 # Function to convert HTML elements to markdown
 def convert_html_to_markdown(element):
     """Convert HTML element to markdown format"""
     markdown_lines = []
     
-    for child in element.children:
-        if child.name == 'h2':
-            markdown_lines.append(f"## {child.get_text(strip=True)}")
-        elif child.name == 'h3':
-            markdown_lines.append(f"### {child.get_text(strip=True)}")
-        elif child.name == 'p':
-            # Skip paragraphs that only contain images
-            text = child.get_text(strip=True)
-            if text and not (len(child.find_all('img')) > 0 and not text):
-                markdown_lines.append(text)
-        elif child.name == 'ul':
-            for li in child.find_all('li'):
-                li_text = li.get_text(strip=True)
-                if li_text:
-                    markdown_lines.append(f"- {li_text}")
-        elif child.name == 'ol':
-            for i, li in enumerate(child.find_all('li'), 1):
-                li_text = li.get_text(strip=True)
-                if li_text:
-                    markdown_lines.append(f"{i}. {li_text}")
-        elif hasattr(child, 'get_text'):
-            # Handle other text elements
-            text = child.get_text(strip=True)
-            if text:
-                markdown_lines.append(text)
+    # Text placed directly in the element, before its first child
+    if element.text and element.text.strip():
+        markdown_lines.append(element.text.strip())
+    
+    for child in element:
+        # Comments and processing instructions have no string tag and are skipped
+        if isinstance(child.tag, str):
+            handler = _MARKDOWN_HANDLERS.get(child.tag, text_to_markdown)
+            markdown_lines.extend(handler(child))
+        
+        # Text following the child, up to the next sibling
+        if child.tail and child.tail.strip():
+            markdown_lines.append(child.tail.strip())
     
     return '\n\n'.join(markdown_lines)
 
 # Function to find and parse JSON-LD scripts
 def find_course_json_ld(html_content):
-    """Find and parse JSON-LD scripts containing Course data"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find all script tags with type="application/ld+json"
-    json_ld_scripts = soup.find_all('script', type='application/ld+json')
+    """Find and parse the first JSON-LD script containing Course data"""
+    # Find the contents of all script tags with type="application/ld+json" in the raw HTML,
+    # so that pages without course data never need a parsed tree
+    json_ld_scripts = _JSON_LD_SCRIPT.findall(html_content)
     
     courses = []
-    for script in json_ld_scripts:
+    for script_text in json_ld_scripts:
+        # Skip Organization, BreadcrumbList and other blocks without decoding them
+        if '"Course"' not in script_text:
+            continue
+        
         try:
-            json_data = json.loads(script.string)
+            json_data = orjson.loads(script_text)
             
             # Handle both single objects and arrays
             if isinstance(json_data, list):
@@ -189,39 +282,114 @@ def find_course_json_ld(html_content):
             elif json_data.get('@type') == 'Course':
                 courses.append(extract_course_data(json_data))
                 
-        except (json.JSONDecodeError, AttributeError) as e:
+        except (orjson.JSONDecodeError, AttributeError) as e:
             print(f"Error parsing JSON-LD: {e}")
             continue
+        
+        # A course page describes its course in a single script, so stop at the first one
+        if courses:
+            break
     
     return courses
 
-# Store all extracted courses
-all_courses = []
+# Function to fetch a single URL
+async def fetch(session, url):
+    """Fetch a URL, retrying with exponential backoff on transient errors"""
+    for attempt in range(MAX_RETRIES + 1):
+        print(f"Fetching: {url}")
+        try:
+            async with session.get(url) as response:
+                response.raise_for_status()  # Raises an error for bad status codes
+                return url, await response.text(errors='replace')  # Undecodable bytes must not abort the crawl
+        except aiohttp.ClientResponseError as e:
+            # Only rate limiting and server errors are worth retrying
+            if e.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                print(f"Error fetching {url}: {e}")
+                return url, None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt == MAX_RETRIES:
+                print(f"Error fetching {url}: {e}")
+                return url, None
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
 
-# Fetch HTML for each URL
-for url in urls:
-    print(f"Fetching: {url}")
+# Function to parse a fetched course page
+def parse_course_page(html_content, url):
+    """Parse a course page and return its JSON-LD courses enriched with HTML-only fields"""
+    # Extract course data from JSON-LD
+    courses = find_course_json_ld(html_content)
+    if not courses:
+        return []
+    
+    # The detailed description and exercises count are only available in the HTML,
+    # so parse the page once and share the tree between all extractors
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raises an error for bad status codes
-        html_content = response.text
+        tree = lxml.html.fromstring(_XML_DECLARATION.sub('', html_content, count=1))
+    except etree.ParserError as e:
+        print(f"Error parsing {url}: {e}")
+        return []
+    
+    detailed_desc = extract_detailed_description(tree)
+    exercises_count = extract_exercises_count(tree)
+    html_skills = None
+    
+    for course in courses:
+        course['source_url'] = url  # Add source URL for reference
+        course['detailed_description'] = detailed_desc  # Add detailed description
+        course['exercises_count'] = exercises_count  # Add exercises count
+        
+        # Skills from the JSON-LD "teaches" property make the skills section lookup unnecessary
+        if not course['skills']:
+            if html_skills is None:
+                html_skills = extract_skills(tree)
+            course['skills'] = html_skills
+    
+    return courses
+
+# Function to fetch queued course pages and queue them for parsing
+async def fetcher(session, url_queue, html_queue):
+    """Fetch pages from the URL queue onto the parse queue until a None sentinel arrives"""
+    while True:
+        url = await url_queue.get()
+        if url is None:
+            break
         
-        print(f"Fetched {len(html_content)} characters from {url}")
+        url, html_content = await fetch(session, url)
+        if html_content is not None:
+            print(f"Fetched {len(html_content)} characters from {url}")
+            await html_queue.put((url, html_content))
+
+# Function to parse queued pages in the process pool
+async def parser(executor, html_queue, parsed_queue):
+    """Parse pages from the parse queue in a worker process until a None sentinel arrives"""
+    loop = asyncio.get_running_loop()
+    while True:
+        page = await html_queue.get()
+        if page is None:
+            break
         
-        # Extract course data from JSON-LD
-        courses = find_course_json_ld(html_content)
+        url, html_content = page
+        try:
+            courses = await loop.run_in_executor(executor, parse_course_page, html_content, url)
+        except Exception as e:
+            # One bad page (or a crashed worker process) must not stop the parser draining the queue
+            print(f"Error parsing {url}: {e}")
+            courses = []
+        await parsed_queue.put((url, courses))
+
+# Function to collect parsed courses
+async def collect_courses(parsed_queue, all_courses):
+    """Drain parsed pages into all_courses until a None sentinel arrives"""
+    while True:
+        result = await parsed_queue.get()
+        if result is None:
+            break
+        
+        url, courses = result
         if courses:
-            # Extract skills, detailed description, and exercises count for each course
-            skills = extract_skills(html_content)
-            detailed_desc = extract_detailed_description(html_content)
-            exercises_count = extract_exercises_count(html_content)
-            
-            for course in courses:
-                course['source_url'] = url  # Add source URL for reference
-                course['skills'] = skills  # Add skills to course data
-                course['detailed_description'] = detailed_desc  # Add detailed description
-                course['exercises_count'] = exercises_count  # Add exercises count
-                all_courses.append(course)
+            all_courses.extend(courses)
+            skills = courses[0]['skills']
+            detailed_desc = courses[0]['detailed_description']
+            exercises_count = courses[0]['exercises_count']
             
             print(f"Extracted {len(courses)} course(s) from {url}")
             if skills:
@@ -243,70 +411,145 @@ for url in urls:
         
         print()
 
-    except requests.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-
-# Print summary
-print(f"\nTotal courses extracted: {len(all_courses)}")
-for i, course in enumerate(all_courses, 1):
-    skills_count = len(course.get('skills', []))
-    exercises_info = f" - {course['exercises_count']} exercises" if course.get('exercises_count') is not None else ""
-    print(f"{i}. {course['title']} - {course['price']} {course['currency']} - {course['courseWorkload_hours']}h - {course['educationalLevel']} - {skills_count} skills{exercises_info}")
-    print(f"Source: {course['source_url']}")
-    print(f"Type: {course['type']}")
-
-    # Display skills as markdown list if available
-    if course.get('skills'):
-        print("   Skills:")
-        for skill in course['skills']:
-            print(f"   - {skill}")
-    print(f"{course['description']}")
-    print(f"{course['detailed_description']}")
-
-# Save extracted courses to CSV file
-if all_courses:
-    csv_filename = 'courses_extracted.csv'
+# Function to fetch all URLs concurrently and extract courses as pages arrive
+async def scrape_courses(urls):
+    """Fetch course pages concurrently and extract course data from each"""
+    all_courses = []
     
-    # Define CSV columns with both description fields
-    fieldnames = ['title', 'url', 'exercises', 'dialect', 'hours', 'kind', 'description', 'detailed_description', 'skills', 'purpose', 'level', 'price']
+    # A fixed set of fetchers takes URLs from here, one page at a time each
+    url_queue = asyncio.Queue()
+    for url in urls:
+        url_queue.put_nowait(url)
+    for _ in range(MAX_CONCURRENT_REQUESTS):
+        url_queue.put_nowait(None)
     
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        # Write header
-        writer.writeheader()
+    # Fetched pages wait here for a free parser. A fetcher blocked on a full queue takes
+    # no new URL, so downloads cannot run ahead of parsing
+    html_queue = asyncio.Queue(maxsize=2 * PARSE_WORKERS)
+    parsed_queue = asyncio.Queue()
+    
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS_PER_HOST)
+    
+    # Parsing is CPU-bound, so it runs in worker processes while the event loop keeps downloading
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        collector = asyncio.create_task(collect_courses(parsed_queue, all_courses))
         
-        # Write course data
-        for course in all_courses:
-            # Format skills as a single string with newlines
-            skills_text = '\n'.join(course.get('skills', [])) if course.get('skills') else ''
+        async def fetch_all():
+            async with aiohttp.ClientSession(connector=connector, headers=REQUEST_HEADERS, timeout=REQUEST_TIMEOUT) as session:
+                await asyncio.gather(*(fetcher(session, url_queue, html_queue) for _ in range(MAX_CONCURRENT_REQUESTS)))
             
-            # Format price with currency
-            price_text = ''
-            if course.get('price') and course.get('currency'):
-                price_text = f"{course['price']} {course['currency']}"
-            elif course.get('price'):
-                price_text = str(course['price'])
+            # All pages are fetched, so stop the parsers
+            for _ in range(PARSE_WORKERS):
+                await html_queue.put(None)
+        
+        # Fetchers and parsers share one gather, so a failing stage raises here instead of
+        # leaving the other one blocked on a full or empty queue
+        await asyncio.gather(fetch_all(), *(parser(executor, html_queue, parsed_queue) for _ in range(PARSE_WORKERS)))
+        await parsed_queue.put(None)
+        await collector
+    
+    # Keep the output in courses.json order regardless of completion order
+    url_order = {url: i for i, url in enumerate(urls)}
+    all_courses.sort(key=lambda course: url_order[course['source_url']])
+    
+    return all_courses
+
+# Function to build a CSV row for a course
+def build_course_row(course):
+    """Build the CSV row for a single course as a tuple of column values"""
+    # Format skills as a single string with newlines
+    skills_text = '\n'.join(course.get('skills', [])) if course.get('skills') else ''
+    
+    # Format price with currency
+    price_text = ''
+    if course.get('price') and course.get('currency'):
+        price_text = f"{course['price']} {course['currency']}"
+    elif course.get('price'):
+        price_text = str(course['price'])
+    
+    # Values in FIELDNAMES order
+    return (
+        course.get('title', ''),  # title
+        course.get('source_url', ''),  # url
+        course.get('exercises_count', ''),  # exercises
+        '',  # dialect: leave empty as requested
+        course.get('courseWorkload_hours', ''),  # hours
+        'Course',  # kind: fill as "Course" as requested
+        course.get('description', ''),  # description: short description from JSON-LD
+        course.get('detailed_description', ''),  # detailed_description: full description in markdown
+        skills_text,  # skills
+        '',  # purpose: leave empty as requested
+        course.get('educationalLevel', ''),  # level
+        price_text  # price
+    )
+
+# Function to read the URLs already saved to the CSV file
+def read_scraped_urls(csv_filename):
+    """Read the source URLs of the courses saved to the CSV file by previous runs"""
+    if not os.path.exists(csv_filename):
+        return set()
+    
+    with open(csv_filename, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        
+        # An empty file or one without the header row has no URLs to skip
+        if not reader.fieldnames or 'url' not in reader.fieldnames:
+            return set()
+        
+        return {row['url'] for row in reader}
+
+def main():
+    csv_filename = 'courses_extracted.csv'
+    
+    # Read URLs from courses.json
+    urls = read_course_urls()
+    
+    # Skip courses saved by previous runs
+    scraped_urls = read_scraped_urls(csv_filename)
+    if scraped_urls:
+        new_urls = [url for url in urls if url not in scraped_urls]
+        print(f"Skipping {len(urls) - len(new_urls)} course(s) already saved to {csv_filename}, {len(new_urls)} left to fetch")
+        urls = new_urls
+    
+    # Fetch HTML for each URL and extract all courses
+    all_courses = asyncio.run(scrape_courses(urls))
+    
+    # Print summary
+    print(f"\nTotal courses extracted: {len(all_courses)}")
+    for i, course in enumerate(all_courses, 1):
+        skills_count = len(course.get('skills', []))
+        exercises_info = f" - {course['exercises_count']} exercises" if course.get('exercises_count') is not None else ""
+        print(f"{i}. {course['title']} - {course['price']} {course['currency']} - {course['courseWorkload_hours']}h - {course['educationalLevel']} - {skills_count} skills{exercises_info}")
+        print(f"Source: {course['source_url']}")
+        print(f"Type: {course['type']}")
+
+        # Display skills as markdown list if available
+        if course.get('skills'):
+            print("   Skills:")
+            for skill in course['skills']:
+                print(f"   - {skill}")
+        print(f"{course['description']}")
+        print(f"{course['detailed_description']}")
+
+    # Save extracted courses to CSV file
+    if all_courses:
+        # Append to the results of previous runs instead of rewriting them
+        # An empty file left behind by an interrupted run still needs the header
+        write_header = not os.path.exists(csv_filename) or os.path.getsize(csv_filename) == 0
+        with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
             
-            # Prepare row data according to specified columns
-            row_data = {
-                'title': course.get('title', ''),
-                'url': course.get('source_url', ''),
-                'exercises': course.get('exercises_count', ''),
-                'dialect': '',  # Leave empty as requested
-                'hours': course.get('courseWorkload_hours', ''),
-                'kind': 'Course',  # Fill as "Course" as requested
-                'description': course.get('description', ''),  # Short description from JSON-LD
-                'detailed_description': course.get('detailed_description', ''),  # Full description in markdown
-                'skills': skills_text,
-                'purpose': '',  # Leave empty as requested
-                'level': course.get('educationalLevel', ''),
-                'price': price_text
-            }
+            # Write header
+            if write_header:
+                writer.writerow(FIELDNAMES)
             
-            writer.writerow(row_data)
-    
-    print(f"\nCourses saved to {csv_filename}")
-    print(f"CSV contains {len(all_courses)} courses with columns: {', '.join(fieldnames)}")
-else:
-    print("\nNo courses extracted, CSV file not created.")
+            # Write course data, building each row according to specified columns
+            writer.writerows(build_course_row(course) for course in all_courses)
+        
+        print(f"\nCourses saved to {csv_filename}")
+        print(f"Added {len(all_courses)} courses with columns: {', '.join(FIELDNAMES)}")
+    else:
+        print(f"\nNo new courses extracted, {csv_filename} not changed.")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 import pandas as pd
 import csv
 import os
+import hashlib
+import shelve
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers.string import StrOutputParser
 from langchain_core.prompts import PromptTemplate
 
+# Maximum number of LLM requests in flight at once
+MAX_CONCURRENCY = 16
+
+# On-disk cache of generated keywords, keyed by a hash of the prompt inputs
+KEYWORD_CACHE_FILE = 'keyword_cache.db'
+
 def generate_keywords_for_courses():
     """
     Read courses from courses_extracted.csv, generate keywords for each course,
@@ -38,20 +46,21 @@ def generate_keywords_for_courses():
 
 
         llm = ChatOpenAI(model="gpt-4o")
+        chain = build_keyword_chain(llm)
+        
+        # Build the prompt inputs for all courses up front
+        inputs = [build_prompt_inputs(row) for row in df.itertuples(index=False)]
+        
+        # Send the prompts concurrently instead of one course at a time
+        print(f"Generating keywords for {len(inputs)} courses...")
+        keywords = generate_keywords(chain, inputs)
+        
+        for i, (course_title, course_keywords) in enumerate(zip(df['title'], keywords)):
+            print(f"Course {i + 1}/{len(df)}: {course_title}")
+            print("Keywords found:", course_keywords)
         
-        # Process each course
-        for i, (index, row) in enumerate(df.iterrows()):
-            # if i>=5: 
-            #     break
-            course_title = row.get('title', 'Unknown Title')
-            print(f"Processing course {i + 1}/{len(df)}: {course_title}")
-            
-            
-            keywords = generate_keywords_for_course(llm, row)
-            print("Keywords found:", keywords)
-            
-            # Update the keywords column
-            df.at[index, 'keywords'] = keywords
+        # Update the keywords column
+        df['keywords'] = keywords
         
         # Save the updated CSV
         df.to_csv(output_file, index=False)
@@ -61,26 +70,17 @@ def generate_keywords_for_courses():
     except Exception as e:
         print(f"Error processing file: {str(e)}")
 
-def generate_keywords_for_course(llm, course_row):
+def build_keyword_chain(llm):
     """
-    Generate keywords for a single course using LLM prompt.
+    Build the prompt | LLM | parser chain used to generate course keywords.
     
     Args:
-        course_row: A pandas Series containing course information
+        llm: The chat model used to generate keywords
         
     Returns:
-        str: Generated keywords (comma-separated)
+        Runnable: Chain taking title, subtitle, description and skills inputs
     """
     
-    # TODO: Implement LLM prompt here
-    # This is a placeholder function that will be replaced with actual LLM integration
-
-    # For now, return a placeholder based on available course information
-    title = course_row.get('title', '')
-    description = course_row.get('detailed_description', '')
-    subtitle = course_row.get('description', '')
-    skills = course_row.get('skills', '')
-
     prompt = """
     You are given a description of an SQL course.
 
@@ -110,15 +110,81 @@ def generate_keywords_for_course(llm, course_row):
         template=prompt
     )
     
-    chain = prompt_template | llm | StrOutputParser()
+    return prompt_template | llm | StrOutputParser()
 
-    keywords = chain.invoke({
-        "title": title,
-        "subtitle": subtitle,
-        "description": description,
-        "skills": skills
-    })
+def build_prompt_inputs(course_row):
+    """
+    Build the keyword prompt inputs for a single course.
+    
+    Args:
+        course_row: A row tuple from DataFrame.itertuples containing course information
+        
+    Returns:
+        dict: Prompt inputs for the keyword chain
+    """
+    
+    return {
+        "title": getattr(course_row, 'title', ''),
+        "subtitle": getattr(course_row, 'description', ''),
+        "description": getattr(course_row, 'detailed_description', ''),
+        "skills": getattr(course_row, 'skills', '')
+    }
+
+def keyword_cache_key(prompt_inputs):
+    """
+    Compute the cache key for a course from the fields used in the prompt.
+    
+    Args:
+        prompt_inputs: Prompt inputs built by build_prompt_inputs
+        
+    Returns:
+        str: Hex digest identifying the prompt inputs
+    """
+    
+    content = '|'.join(str(prompt_inputs[field]) for field in ("title", "subtitle", "description", "skills"))
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
 
+def generate_keywords(chain, inputs):
+    """
+    Generate keywords for a list of courses using concurrent LLM calls.
+    
+    Courses whose prompt inputs are unchanged since a previous run are served
+    from the on-disk cache, and only the remaining ones are sent to the LLM.
+    
+    Args:
+        chain: The keyword chain built by build_keyword_chain
+        inputs: Prompt inputs, one dict per course
+        
+    Returns:
+        list[str]: Generated keywords (comma-separated), in the order of inputs
+        
+    Raises:
+        RuntimeError: If any LLM call failed; the successful ones are still cached
+    """
+    
+    keys = [keyword_cache_key(prompt_inputs) for prompt_inputs in inputs]
+    
+    with shelve.open(KEYWORD_CACHE_FILE) as cache:
+        keywords = [cache.get(key) for key in keys]
+        missing = [i for i, course_keywords in enumerate(keywords) if course_keywords is None]
+        print(f"Found cached keywords for {len(inputs) - len(missing)} courses.")
+        
+        failures = []
+        if missing:
+            generated = chain.batch([inputs[i] for i in missing], config={"max_concurrency": MAX_CONCURRENCY}, return_exceptions=True)
+            for i, course_keywords in zip(missing, generated):
+                # Cache every successful call so a rerun only retries the failed courses
+                if isinstance(course_keywords, Exception):
+                    failures.append((inputs[i]['title'], course_keywords))
+                    continue
+                keywords[i] = course_keywords
+                cache[keys[i]] = course_keywords
+    
+    if failures:
+        for title, error in failures:
+            print(f"Error generating keywords for {title}: {error}")
+        raise RuntimeError(f"Keyword generation failed for {len(failures)} of {len(inputs)} courses")
+    
     return keywords
 
 def main():
@@ -1,9 +1,65 @@
-import requests
-import time
-import json
+import os
 import re
+import asyncio
+import aiohttp
+import orjson
 import csv
-from bs4 import BeautifulSoup, Tag
+from concurrent.futures import ProcessPoolExecutor
+import lxml.html
+from lxml import etree
+
+# Columns of the output CSV file
+FIELDNAMES = ['title', 'url', 'exercises', 'dialect', 'hours', 'kind', 'description', 'detailed_description', 'skills', 'purpose', 'level', 'price']
+
+# lxml refuses str input that starts with an XML declaration naming an encoding
+_XML_DECLARATION = re.compile(r'^<\?xml[^>]*\?>')
+
+# Namespace of the EXSLT regular expression functions used in the XPaths below
+_RE_NS = {'re': 'http://exslt.org/regular-expressions'}
+
+# Predicates matching the skills and description section headings, tried in this order
+_SKILLS_HEADINGS = [
+    "re:test(normalize-space(.), 'Skills you will gain', 'i')",
+    "re:test(@id, 'skillsSection', 'i')",
+    "re:test(@class, 'skillsSection', 'i')"
+]
+_DESC_HEADINGS = [
+    "re:test(normalize-space(.), 'Description', 'i')",
+    "re:test(@id, 'description', 'i')",
+    "re:test(@class, 'description', 'i')"
+]
+
+# Compiled XPath queries shared by the extractors below
+_SKILL_ITEMS = [
+    etree.XPath(f"(//h2[{heading}])[1]/following::ul[1]//li", namespaces=_RE_NS)
+    for heading in _SKILLS_HEADINGS
+]
+# For each heading, prefer productDescriptionSection__content over the generic content class
+_DESC_SECTIONS = [
+    etree.XPath(f"(//h2[{heading}])[1]/following::div[contains(@class, '{section_class}')][1]", namespaces=_RE_NS)
+    for heading in _DESC_HEADINGS
+    for section_class in ('productDescriptionSection__content', 'content')
+]
+_JSON_LD_SCRIPTS = etree.XPath("//script[@type='application/ld+json']")
+_TEXT_NODES = etree.XPath(".//text()[normalize-space()]", smart_strings=False)
+
+# Limits for concurrent fetching
+MAX_CONCURRENT_REQUESTS = 64
+MAX_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = 8
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3  # seconds, doubled after every failed attempt
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Number of worker processes parsing fetched pages
+PARSE_WORKERS = os.cpu_count() or 1
+
+# Settings shared by every request of the HTTP session
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(sock_connect=15, sock_read=15)
+REQUEST_HEADERS = {
+    'Accept-Encoding': 'gzip, deflate',
+    'User-Agent': 'Mozilla/5.0 (compatible; course-scraper/1.0)'
+}
 
 def read_track_urls(filename='tracks.txt'):
     """Read track URLs from file."""
@@ -11,155 +67,174 @@ def read_track_urls(filename='tracks.txt'):
         urls = [line.strip() for line in file if line.strip()]
     return urls
 
-def fetch_track_content(url):
-    """Fetch content from a track URL."""
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.text
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching {url}: {e}")
-        return None
+async def fetch_track_content(session, semaphore, url):
+    """Fetch content from a track URL, retrying transient errors with exponential backoff."""
+    async with semaphore:
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    return url, await response.text(errors='replace')  # Undecodable bytes must not abort the crawl
+            except aiohttp.ClientResponseError as e:
+                # Only rate limiting and server errors are worth retrying
+                if e.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    print(f"Error fetching {url}: {e}")
+                    return url, None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == MAX_RETRIES:
+                    print(f"Error fetching {url}: {e}")
+                    return url, None
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+def get_text(element):
+    """Get the text of an element, stripping each text fragment like BeautifulSoup's get_text(strip=True)."""
+    # Blank text nodes are dropped by libxml2 before they reach Python
+    return ''.join(text.strip() for text in _TEXT_NODES(element))
+
+def first_matches(xpaths, node):
+    """Return the matches of the first compiled XPath that matches anything, or an empty list."""
+    for xpath in xpaths:
+        matches = xpath(node)
+        if matches:
+            return matches
+    return []
 
-def extract_skills(html_content):
+def extract_skills(tree):
     """Extract skills from 'Skills you will gain' section"""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # Find the skills section heading
-    skills_heading = soup.find('h2', string=re.compile(r'Skills you will gain', re.IGNORECASE))
-    if not skills_heading:
-        # Try to find by id or class
-        skills_heading = soup.find('h2', {'id': re.compile(r'skillsSection', re.IGNORECASE)}) or \
-                        soup.find('h2', {'class': re.compile(r'skillsSection', re.IGNORECASE)})
+    # Find the li elements of the next ul after the skills section heading,
+    # trying the heading text first and then its id or class
+    skill_items = first_matches(_SKILL_ITEMS, tree)
     
-    if skills_heading:
-        # Find the next ul element after the heading
-        skills_list = skills_heading.find_next('ul')
-        if skills_list and isinstance(skills_list, Tag):
-            # Extract all li elements and get their text content
-            skills = []
-            for li in skills_list.find_all('li'):
-                if isinstance(li, Tag):
-                    skill_text = li.get_text(strip=True)
-                    if skill_text:
-                        skills.append(skill_text)
-            return skills
-    
-    return []
+    # Get the text content of the li elements
+    skill_texts = (get_text(li) for li in skill_items)
+    return [skill_text for skill_text in skill_texts if skill_text]
 
-def extract_detailed_description(html_content):
+def extract_detailed_description(tree):
     """Extract detailed description section and convert to markdown"""
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Find the content section after the description heading,
+    # trying the heading text first and then its id or class
+    content_sections = first_matches(_DESC_SECTIONS, tree)
     
-    # Find the description section heading
-    desc_heading = soup.find('h2', string=re.compile(r'Description', re.IGNORECASE))
-    if not desc_heading:
-        # Try to find by id or class
-        desc_heading = soup.find('h2', {'id': re.compile(r'description', re.IGNORECASE)}) or \
-                      soup.find('h2', {'class': re.compile(r'description', re.IGNORECASE)})
+    if content_sections:
+        # Convert the entire content section to markdown
+        return convert_html_to_markdown(content_sections[0])
     
-    if desc_heading:
-        # Find the content section after the heading
-        content_section = desc_heading.find_next('div', class_=re.compile(r'productDescriptionSection__content', re.IGNORECASE))
-        if not content_section:
-            # Fallback to generic content class
-            content_section = desc_heading.find_next('div', class_=re.compile(r'content', re.IGNORECASE))
+    return ''
+
+def is_nested_in_li(element):
+    """Check whether an element sits inside an li element."""
+    return next(element.iterancestors('li'), None) is not None
+
+def append_inline_text(element, parts):
+    """Append the stripped text fragments of an element to parts, wrapping bold elements in **."""
+    if element.text:
+        parts.append(element.text.strip())
+    
+    for child in element:
+        # Comments and processing instructions have no string tag; only their tail is text
+        if isinstance(child.tag, str):
+            if child.tag in ('b', 'strong'):
+                bold_text = get_text(child)
+                if bold_text:
+                    parts.append(f"**{bold_text}**")
+            else:
+                append_inline_text(child, parts)
         
-        if content_section:
-            # Convert the entire content section to markdown
-            markdown_content = convert_html_to_markdown(content_section)
-            return markdown_content
+        if child.tail:
+            parts.append(child.tail.strip())
+
+def list_item_text(li):
+    """Get the text of a list item with its bold parts marked up."""
+    # Build the text in a single pass over the item, so only the bold elements themselves get marked up
+    parts = []
+    append_inline_text(li, parts)
+    return ''.join(parts)
+
+def h2_to_markdown(element):
+    """Convert an h2 element to markdown lines."""
+    text = get_text(element)
+    return [f"## {text}"] if text else []
+
+def h3_to_markdown(element):
+    """Convert an h3 element to markdown lines."""
+    text = get_text(element)
+    return [f"### {text}"] if text else []
+
+def p_to_markdown(element):
+    """Convert a p element to markdown lines."""
+    # Skip paragraphs that only contain images or picture elements
+    text = get_text(element)
+    if text and element.find('.//picture') is None and element.find('.//img') is None:
+        return [text]
+    return []
+
+def ul_to_markdown(element):
+    """Convert a ul element to markdown lines."""
+    # Only process ul that are not nested in li elements
+    if is_nested_in_li(element):
+        return []
     
-    return ''
+    lines = []
+    for li in element.iterchildren('li'):
+        li_text = list_item_text(li)
+        if li_text:
+            lines.append(f"- {li_text}")
+    return lines
+
+def ol_to_markdown(element):
+    """Convert an ol element to markdown lines."""
+    # Only process ol that are not nested in li elements
+    if is_nested_in_li(element):
+        return []
+    
+    lines = []
+    for i, li in enumerate(element.iterchildren('li'), 1):
+        li_text = list_item_text(li)
+        if li_text:
+            lines.append(f"{i}. {li_text}")
+    return lines
+
+# Markdown converters for the elements kept in descriptions, by tag
+_MARKDOWN_HANDLERS = {
+    'h2': h2_to_markdown,
+    'h3': h3_to_markdown,
+    'p': p_to_markdown,
+    'ul': ul_to_markdown,
+    'ol': ol_to_markdown
+}
 
 def convert_html_to_markdown(element):
     """Convert HTML element to markdown format"""
     markdown_lines = []
     
-    # Process all elements in the content section
-    for child in element.find_all(recursive=True):
-        if child.name == 'h2':
-            text = child.get_text(strip=True)
-            if text and f"## {text}" not in markdown_lines:
-                markdown_lines.append(f"## {text}")
-        elif child.name == 'h3':
-            text = child.get_text(strip=True)
-            if text and f"### {text}" not in markdown_lines:
-                markdown_lines.append(f"### {text}")
-        elif child.name == 'p':
-            # Skip paragraphs that only contain images or picture elements
-            text = child.get_text(strip=True)
-            if text and not child.find('picture') and not child.find('img'):
-                if text not in markdown_lines:
-                    markdown_lines.append(text)
-        elif child.name == 'ul' and not child.find_parent('li'):
-            # Only process ul that are not nested in li elements
-            ul_items = []
-            for li in child.find_all('li', recursive=False):
-                li_text = li.get_text(strip=True)
-                if li_text:
-                    # Handle bold text in list items
-                    bold_elements = li.find_all(['b', 'strong'])
-                    if bold_elements:
-                        for bold_elem in bold_elements:
-                            bold_text = bold_elem.get_text(strip=True)
-                            li_text = li_text.replace(bold_text, f"**{bold_text}**")
-                    ul_items.append(f"- {li_text}")
-            
-            # Add items if they're not already in markdown_lines
-            for item in ul_items:
-                if item not in markdown_lines:
-                    markdown_lines.append(item)
-        elif child.name == 'ol' and not child.find_parent('li'):
-            # Only process ol that are not nested in li elements
-            ol_items = []
-            for i, li in enumerate(child.find_all('li', recursive=False), 1):
-                li_text = li.get_text(strip=True)
-                if li_text:
-                    # Handle bold text in list items
-                    bold_elements = li.find_all(['b', 'strong'])
-                    if bold_elements:
-                        for bold_elem in bold_elements:
-                            bold_text = bold_elem.get_text(strip=True)
-                            li_text = li_text.replace(bold_text, f"**{bold_text}**")
-                    ol_items.append(f"{i}. {li_text}")
-            
-            # Add items if they're not already in markdown_lines
-            for item in ol_items:
-                if item not in markdown_lines:
-                    markdown_lines.append(item)
+    # Process the converted elements of the content section, filtered by tag inside lxml
+    for child in element.iterdescendants(*_MARKDOWN_HANDLERS):
+        markdown_lines.extend(_MARKDOWN_HANDLERS[child.tag](child))
     
     # Remove duplicates while preserving order
-    seen = set()
-    unique_lines = []
-    for line in markdown_lines:
-        if line not in seen:
-            seen.add(line)
-            unique_lines.append(line)
-    
-    return '\n\n'.join(unique_lines)
+    return '\n\n'.join(dict.fromkeys(markdown_lines))
 
 def extract_track_info(html_content):
     """Extract track information from HTML content."""
     try:
         # Find the JSON-LD script tags (we want the second one)
-        soup = BeautifulSoup(html_content, 'html.parser')
-        script_tags = soup.find_all('script', {'type': 'application/ld+json'})
+        tree = lxml.html.fromstring(_XML_DECLARATION.sub('', html_content, count=1))
+        script_tags = _JSON_LD_SCRIPTS(tree)
         
         if len(script_tags) < 2:
             return None
         
         script_tag = script_tags[1]  # Get the second script tag
         
-        if not script_tag:
+        if script_tag is None:
             return None
         
         # Parse the JSON data
-        json_data = json.loads(script_tag.get_text())
+        json_data = orjson.loads(script_tag.text_content())
         
         # Extract skills and detailed description from HTML
-        skills = extract_skills(html_content)
-        detailed_description = extract_detailed_description(html_content)
+        skills = extract_skills(tree)
+        detailed_description = extract_detailed_description(tree)
         
         # Extract required information
         track_name = json_data.get('name', '')
@@ -197,65 +272,96 @@ def extract_track_info(html_content):
         
         return track_info
         
-    except (json.JSONDecodeError, AttributeError, KeyError) as e:
+    except (orjson.JSONDecodeError, etree.ParserError, AttributeError, KeyError) as e:
         print(f"Error parsing track info: {e}")
         return None
 
+def build_track_row(track):
+    """Build the CSV row for a single track as a tuple of column values."""
+    # Convert skills list to comma-separated string
+    skills_str = ', '.join(track['skills']) if track['skills'] else ''
+    
+    # Values in FIELDNAMES order
+    return (
+        track['name'],  # title
+        track['url'],  # url
+        '',  # exercises: leave empty as requested
+        track['dialect'],  # dialect
+        track['hours'],  # hours
+        'Track',  # kind: set to 'Track' as requested
+        track['description'],  # description
+        track['detailed_description'],  # detailed_description
+        skills_str,  # skills
+        track['purpose'],  # purpose
+        track['level'],  # level
+        track['price']  # price
+    )
+
 def save_tracks_to_csv(tracks_data, filename='tracks.csv'):
     """Save tracks data to CSV file with specified columns"""
-    fieldnames = ['title', 'url', 'exercises', 'dialect', 'hours', 'kind', 'description', 'detailed_description', 'skills', 'purpose', 'level', 'price']
-    
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for track in tracks_data:
-            # Convert skills list to comma-separated string
-            skills_str = ', '.join(track['skills']) if track['skills'] else ''
-            
-            row = {
-                'title': track['name'],
-                'url': track['url'],
-                'exercises': '',  # Leave empty as requested
-                'dialect': track['dialect'],
-                'hours': track['hours'],
-                'kind': 'Track',  # Set to 'Track' as requested
-                'description': track['description'],
-                'detailed_description': track['detailed_description'],
-                'skills': skills_str,
-                'purpose': track['purpose'],
-                'level': track['level'],
-                'price': track['price']
-            }
-            writer.writerow(row)
+        writer = csv.writer(csvfile)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(build_track_row(track) for track in tracks_data)
     
     print(f"\nSaved {len(tracks_data)} tracks to {filename}")
 
-def main():
-    # Read URLs from tracks.txt
-    urls = read_track_urls()
-    print(f"Found {len(urls)} track URLs")
-    
-    # Fetch content and extract info for each URL
+async def extract_in_worker(executor, url, content):
+    """Run extract_track_info in the process pool and pair the result with its URL."""
+    loop = asyncio.get_running_loop()
+    try:
+        return url, await loop.run_in_executor(executor, extract_track_info, content)
+    except Exception as e:
+        # One bad page (or a crashed worker process) must not lose the tracks extracted so far
+        print(f"Error parsing track info from {url}: {e}")
+        return url, None
+
+async def process_tracks(urls):
+    """Fetch all track URLs concurrently and extract info as pages arrive."""
     tracks_data = []
-    for i, url in enumerate(urls, 1):
-        print(f"Processing {i}/{len(urls)}: {url}")
-        content = fetch_track_content(url)
+    
+    # The connector caps connections per host, which keeps the crawl polite
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=MAX_CONNECTIONS_PER_HOST)
+    
+    # Parsing is CPU-bound, so it runs in worker processes while the event loop keeps downloading
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        extract_tasks = []
+        async with aiohttp.ClientSession(connector=connector, headers=REQUEST_HEADERS, timeout=REQUEST_TIMEOUT) as session:
+            tasks = [fetch_track_content(session, semaphore, url) for url in urls]
+            
+            for i, next_page in enumerate(asyncio.as_completed(tasks), 1):
+                url, content = await next_page
+                print(f"Processing {i}/{len(urls)}: {url}")
+                
+                if content:
+                    extract_tasks.append(asyncio.create_task(extract_in_worker(executor, url, content)))
+                else:
+                    print(f"  ✗ Failed to fetch")
         
-        if content:
-            track_info = extract_track_info(content)
+        for next_result in asyncio.as_completed(extract_tasks):
+            url, track_info = await next_result
             if track_info:
                 track_info['url'] = url
                 tracks_data.append(track_info)
                 skills_count = len(track_info['skills'])
                 print(f"  ✓ Extracted: {track_info['name']} - ${track_info['price']} - {track_info['hours']}h - {track_info['level']} - {track_info['dialect']} - {track_info['purpose']} - {skills_count} skills")
             else:
-                print(f"  ✗ Failed to extract track info")
-        else:
-            print(f"  ✗ Failed to fetch")
-        
-        # Small delay to be polite
-        time.sleep(0.5)
+                print(f"  ✗ Failed to extract track info from {url}")
+    
+    # Keep the output in tracks.txt order regardless of completion order
+    url_order = {url: i for i, url in enumerate(urls)}
+    tracks_data.sort(key=lambda track: url_order[track['url']])
+    
+    return tracks_data
+
+def main():
+    # Read URLs from tracks.txt
+    urls = read_track_urls()
+    print(f"Found {len(urls)} track URLs")
+    
+    # Fetch content and extract info for each URL
+    tracks_data = asyncio.run(process_tracks(urls))
     
     print(f"\nSuccessfully processed {len(tracks_data)} tracks")
     